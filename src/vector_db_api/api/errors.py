@@ -2,10 +2,13 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from vector_db_api.services.exceptions import NotFoundError, ConflictError, ValidationError
 
+# Handler callables built once at import; register_exception_handlers just
+# wires the cached functions instead of defining new closures per app
+async def _nf(_: Request, e: NotFoundError): return JSONResponse({"detail": str(e)}, status_code=404)
+async def _cf(_: Request, e: ConflictError): return JSONResponse({"detail": str(e)}, status_code=409)
+async def _ve(_: Request, e: ValidationError): return JSONResponse({"detail": str(e)}, status_code=422)
+
 def register_exception_handlers(app: FastAPI):
-    @app.exception_handler(NotFoundError)
-    async def _nf(_: Request, e: NotFoundError): return JSONResponse({"detail": str(e)}, status_code=404)
-    @app.exception_handler(ConflictError)
-    async def _cf(_: Request, e: ConflictError): return JSONResponse({"detail": str(e)}, status_code=409)
-    @app.exception_handler(ValidationError)
-    async def _ve(_: Request, e: ValidationError): return JSONResponse({"detail": str(e)}, status_code=422)
\ No newline at end of file
+    app.add_exception_handler(NotFoundError, _nf)
+    app.add_exception_handler(ConflictError, _cf)
+    app.add_exception_handler(ValidationError, _ve)
@@ -3,6 +3,8 @@ from collections import defaultdict
 from uuid import UUID
 
 class ReadWriteLock:
+    __slots__ = ("reads", "read_lock", "write_lock")
+
     def __init__(self) -> None:
         self.reads = 0
         self.read_lock = threading.Lock()
@@ -27,8 +29,13 @@ class ReadWriteLock:
         self.write_lock.release()
 
 class LibraryLockRegistry:
+    __slots__ = ("locks",)
+
     def __init__(self) -> None:
         self.locks = defaultdict(ReadWriteLock)
     
     def lock_for_library(self, lib_id: UUID) -> ReadWriteLock:
-        return self.locks[lib_id]
\ No newline at end of file
+        return self.locks[lib_id]
+
+    def __len__(self) -> int:
+        return len(self.locks)
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Optional numba-compiled kernels for the LSH hot path.
+
+numba is not a hard dependency; when it is missing the module exposes
+NumPy implementations with identical signatures and LSHIndex keeps its
+vectorized paths. When numba is present the kernels are compiled once at
+import and used for large candidate sets.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def pack_signs(proj: np.ndarray) -> np.uint64:
+        """Pack the sign bits of a projection vector into a uint64"""
+        sig = np.uint64(0)
+        for i in range(proj.size):
+            if proj[i] >= 0.0:
+                sig |= np.uint64(1) << np.uint64(i)
+        return sig
+
+    @njit(cache=True, parallel=True, fastmath=True)
+    def score_rows_dot(mat: np.ndarray, rows: np.ndarray, q: np.ndarray, out: np.ndarray) -> None:
+        """Dot product of each selected matrix row with q, float64 accumulate"""
+        for i in prange(rows.size):
+            s = 0.0
+            r = rows[i]
+            for j in range(mat.shape[1]):
+                s += mat[r, j] * q[j]
+            out[i] = s
+else:
+    def pack_signs(proj: np.ndarray) -> np.uint64:
+        """Pack the sign bits of a projection vector into a uint64"""
+        bits = proj >= 0.0
+        weights = np.left_shift(np.uint64(1), np.arange(proj.size, dtype=np.uint64))
+        return np.uint64(bits.astype(np.uint64) @ weights)
+
+    def score_rows_dot(mat: np.ndarray, rows: np.ndarray, q: np.ndarray, out: np.ndarray) -> None:
+        """Dot product of each selected matrix row with q, float64 accumulate"""
+        out[:] = mat[rows].astype(np.float64) @ q.astype(np.float64)
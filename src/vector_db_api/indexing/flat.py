@@ -1,6 +1,9 @@
-from typing import Dict, List, Tuple
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
+import numpy as np
+
 from vector_db_api.indexing.base import BaseIndex
 from vector_db_api.indexing.utils import get_similarity_function
 
@@ -8,22 +11,67 @@ from vector_db_api.indexing.utils import get_similarity_function
 class FlatIndex(BaseIndex):
     def __init__(self) -> None:
         self.vectors: Dict[UUID, List[float]] = {}
-    
+
     def add(self, chunk_id: UUID, vec: List[float]) -> None:
         self.vectors[chunk_id] = vec
-    
+        self._invalidate_dense()
+
     def update(self, chunk_id: UUID, vec: List[float]) -> None:
         self.vectors[chunk_id] = vec
-    
+        self._invalidate_dense()
+
     def remove(self, chunk_id: UUID) -> None:
         self.vectors.pop(chunk_id, None)
-    
+        self._invalidate_dense()
+
+    @cached_property
+    def _dense(self) -> Optional[Tuple[List[UUID], np.ndarray]]:
+        """Packed (ids, matrix) view of the stored vectors, rebuilt lazily
+        after mutations; None when the vectors can't share one matrix"""
+        try:
+            matrix = np.asarray(list(self.vectors.values()), dtype=np.float64)
+        except ValueError:
+            return None
+        if matrix.ndim != 2:
+            return None
+        return list(self.vectors.keys()), matrix
+
+    def _invalidate_dense(self) -> None:
+        self.__dict__.pop("_dense", None)
+
     def search(self, query: List[float], k: int = 10, metric: str = "cosine") -> List[Tuple[UUID, float]]:
+        # Validate the metric up front so both paths reject unknown metrics
         similarity_func = get_similarity_function(metric)
-        similarities = [(chunk_id, similarity_func(query, vec)) for chunk_id, vec in self.vectors.items()]
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:k]
-    
+        if not self.vectors:
+            return []
+
+        dense = self._dense
+        query_arr = np.asarray(query, dtype=np.float64)
+        if dense is None or query_arr.shape != (dense[1].shape[1],):
+            # Mixed-dimension vectors can't be packed into one matrix;
+            # fall back to the per-vector similarity loop
+            similarities = [(chunk_id, similarity_func(query, vec)) for chunk_id, vec in self.vectors.items()]
+            similarities.sort(key=lambda x: x[1], reverse=True)
+            return similarities[:k]
+
+        ids, matrix = dense
+        scores = self._score_matrix(matrix, query_arr, metric)
+        order = np.argsort(-scores)[:k]
+        return [(ids[i], float(scores[i])) for i in order]
+
+    @staticmethod
+    def _score_matrix(matrix: np.ndarray, query: np.ndarray, metric: str) -> np.ndarray:
+        """Score all stored vectors against the query in one vectorized pass"""
+        if metric == "cosine":
+            dots = matrix @ query
+            denom = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+            # Zero vectors get similarity 0, matching cosine_similarity
+            return np.divide(dots, denom, out=np.zeros_like(dots), where=denom != 0)
+        if metric == "euclidean":
+            return 1.0 / (1.0 + np.linalg.norm(matrix - query, axis=1))
+        # dot_product
+        return matrix @ query
+
     def rebuild(self, items: List[Tuple[UUID, List[float]]]) -> None:
         self.vectors = {chunk_id: vec for chunk_id, vec in items}
-    
\ No newline at end of file
+        self._invalidate_dense()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import math, random, threading
 from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID
@@ -29,14 +30,32 @@ class IVFIndex(BaseIndex):
         self.k = max(1, int(num_centroids))
         self.nprobe = max(1, int(nprobe))
 
-        self.rng = random.Random(seed)
+        self.seed = seed
+        self._rng: Optional[random.Random] = None  # seeded lazily; only rebuild needs it
         self.centroids: List[List[float]] = []
         self.lists: Dict[int, Set[UUID]] = {}
         self.vecs: Dict[UUID, List[float]] = {}
         self.assign: Dict[UUID, int] = {}
 
         self.lock = threading.RLock()
-    
+
+    @property
+    def rng(self) -> random.Random:
+        if self._rng is None:
+            self._rng = random.Random(self.seed)
+        return self._rng
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> "IVFIndex":
+        # Locks can't be deep-copied; give the clone its own fresh RLock
+        clone = IVFIndex(self.dim, self.k, self.nprobe, seed=self.seed)
+        memo[id(self)] = clone
+        clone._rng = copy.deepcopy(self._rng, memo)
+        clone.centroids = copy.deepcopy(self.centroids, memo)
+        clone.lists = copy.deepcopy(self.lists, memo)
+        clone.vecs = copy.deepcopy(self.vecs, memo)
+        clone.assign = copy.deepcopy(self.assign, memo)
+        return clone
+
     def add(self, chunk_id: UUID, vec: List[float]) -> None:
         norm_vec = normalize(vec)
         if norm_vec is None:
@@ -1,41 +1,108 @@
 from __future__ import annotations
 
+import copy
 import math, random, threading
-from typing import Dict, List, Optional, Set, Tuple
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Set, Tuple, Union
 from uuid import UUID
 
+import numpy as np
+
 from vector_db_api.indexing.base import BaseIndex
-from vector_db_api.indexing.utils import dot, normalize, get_similarity_function
+from vector_db_api.indexing._lsh_kernels import HAVE_NUMBA, pack_signs, score_rows_dot
+from vector_db_api.indexing.utils import get_similarity_function
 
 LSH_OVERSAMPLE: int = 6 # verify up to K * LSH_OVERSAMPLE candidates
 LSH_MAX_CANDIDATES: Optional[int] = None
+LSH_NUMBA_MIN_ROWS: int = 64 # candidate count above which the numba kernel pays off
+LSH_INT8_PRESCORE: bool = False # prune candidates with an int8 dot before exact scoring
+LSH_INT8_RERANK_POOL: int = 32 # minimum pool kept for exact re-scoring when pruning
+LSH_EPS_SQ: float = 1e-24 # squared-norm threshold below which a vector counts as zero
+
+class _VectorView(Mapping):
+    """Read-only chunk_id -> normalized-vector mapping over the SoA matrix"""
+
+    def __init__(self, index: "LSHIndex") -> None:
+        self._index = index
+
+    def __getitem__(self, chunk_id: UUID) -> np.ndarray:
+        return self._index._mat[self._index._row[chunk_id]]
+
+    def __iter__(self):
+        return iter(self._index._row)
+
+    def __len__(self) -> int:
+        return len(self._index._row)
+
+
+def _quantize_i8(norm_vec: np.ndarray) -> np.ndarray:
+    """Scale a unit vector by 127 and round to int8"""
+    return np.clip(np.round(norm_vec * 127.0), -127, 127).astype(np.int8)
+
+
+def _normalize(vec: List[float]) -> Optional[np.ndarray]:
+    """L2-normalize to a float32 ndarray; None for (near-)zero vectors"""
+    arr = np.asarray(vec, dtype=np.float32)
+    # Compare against the squared norm so the zero case never pays a sqrt
+    sq = float(arr @ arr)
+    if sq < LSH_EPS_SQ:
+        return None
+    return arr * (1.0 / math.sqrt(sq))
 
 class LSHTable:
-    def __init__(self, dim: int, H: int, rng: random.Random) -> None:
+    def __init__(self, dim: int, H: int, rng: Union[random.Random, np.random.Generator, int, None] = None) -> None:
         self.dim = dim
         self.H = H
-        self.hyperplanes: List[List[float]] = [[rng.gauss(0.0, 1.0) for _ in range(dim)] for _ in range(H)]
-        self.buckets: Dict[int, Set[UUID]] = {}
-    
+        if isinstance(rng, random.Random):
+            # Legacy callers hand us a Python RNG; derive a NumPy seed from it
+            rng = np.random.default_rng(rng.getrandbits(64))
+        elif not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng(rng)
+        # Packed (H, dim) hyperplane matrix so signatures are one matvec;
+        # generated in one C call instead of H*dim Python gauss() calls
+        self.hyperplanes: np.ndarray = rng.standard_normal((H, dim)).astype(np.float32)
+        # Cached bit weights (1 << i) used to pack sign bits into an int
+        self._weights: np.ndarray = np.left_shift(np.uint64(1), np.arange(min(H, 64), dtype=np.uint64))
+        # sig -> sorted member array; LSHIndex stores matrix row indices here
+        self.buckets: Dict[int, np.ndarray] = {}
+
     def signature(self, vec: List[float]) -> int:
-        sig = 0
-        for i, hp in enumerate(self.hyperplanes):
-            if dot(vec, hp) >= 0.0:
-                sig |= (1 << i)
-        return sig
-    
-    def add(self, chunk_id: UUID, vec: List[float]) -> None:
-        sig = self.signature(vec)
-        self.buckets.setdefault(sig, set()).add(chunk_id)
-    
-    def remove(self, chunk_id: UUID, vec: List[float]) -> None:
-        sig = self.signature(vec)
+        proj = self.hyperplanes @ np.asarray(vec, dtype=np.float32)
+        if self.H > 64:
+            sig = 0
+            for i in np.flatnonzero(proj >= 0.0):
+                sig |= (1 << int(i))
+            return sig
+        if HAVE_NUMBA:
+            return int(pack_signs(proj))
+        return int((proj >= 0.0).astype(np.uint64) @ self._weights)
+
+    def insert(self, sig: int, member: int) -> None:
+        bucket = self.buckets.get(sig)
+        if bucket is None:
+            dtype = np.intp if isinstance(member, (int, np.integer)) else object
+            self.buckets[sig] = np.asarray([member], dtype=dtype)
+            return
+        i = int(np.searchsorted(bucket, member))
+        self.buckets[sig] = np.insert(bucket, i, member)
+
+    def discard(self, sig: int, member: int) -> None:
         bucket = self.buckets.get(sig)
-        if not bucket:
+        if bucket is None:
+            return
+        i = int(np.searchsorted(bucket, member))
+        if i >= bucket.size or bucket[i] != member:
             return
-        bucket.discard(chunk_id)
-        if not bucket:
+        if bucket.size == 1:
             self.buckets.pop(sig, None)
+        else:
+            self.buckets[sig] = np.delete(bucket, i)
+
+    def add(self, member: int, vec: List[float]) -> None:
+        self.insert(self.signature(vec), member)
+
+    def remove(self, member: int, vec: List[float]) -> None:
+        self.discard(self.signature(vec), member)
 
 
 # TODO: understand working of LSH index
@@ -50,84 +117,295 @@ class LSHIndex(BaseIndex):
         self.L = max(1, int(num_tables))
         self.H = max(1, int(hyperplanes_per_table))
 
-        self.rng = random.Random(seed)
-        self.tables: List[LSHTable] = [LSHTable(dim, self.H, self.rng) for _ in range(self.L)]
-        self.vecs: Dict[UUID, List[float]] = {}     # normalized vectors
+        # One spawned child seed per table keeps tables independent but
+        # reproducible for a given seed
+        table_seeds = np.random.SeedSequence(seed).spawn(self.L)
+        self.tables: List[LSHTable] = [LSHTable(dim, self.H, np.random.default_rng(ts)) for ts in table_seeds]
+        # All tables' hyperplanes stacked to (L*H, dim): one matvec yields
+        # every table's projections at once
+        self.all_planes: np.ndarray = np.vstack([t.hyperplanes for t in self.tables])
+        # SoA storage: normalized vectors live in one contiguous matrix,
+        # with id/row maps on the side; vecs is a mapping view over it
+        self._mat: np.ndarray = np.empty((0, dim), dtype=np.float32)
+        # int8 shadow of _mat (rows scaled by 127) for quantized pre-scoring
+        self._mat_i8: np.ndarray = np.empty((0, dim), dtype=np.int8)
+        # Exact float64 norm of each stored row, cached at insert time so
+        # cosine scoring never recomputes them per query
+        self._norms: np.ndarray = np.empty(0, dtype=np.float64)
+        self._ids: List[Optional[UUID]] = []
+        self._row: Dict[UUID, int] = {}
+        self._free: List[int] = []
+        # Scratch bitmap for candidate dedup; always zeroed between searches
+        self._visited: np.ndarray = np.zeros(0, dtype=np.uint8)
+        # Scratch projection buffer reused by _signatures; every caller
+        # holds self.lock, so a single shared buffer is safe
+        self._proj_buf: np.ndarray = np.empty(self.L * self.H, dtype=np.float32)
+        # Cached bit weights shared by the batched signature path
+        self._weights: np.ndarray = np.left_shift(np.uint64(1), np.arange(min(self.H, 64), dtype=np.uint64))
+        self.vecs: Mapping = _VectorView(self)
         self.lock = threading.RLock()
-    
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> "LSHIndex":
+        # Locks can't be deep-copied; give the clone its own fresh RLock,
+        # and rebind the vecs view to the clone
+        cls = type(self)
+        clone = cls.__new__(cls)
+        memo[id(self)] = clone
+        for name, value in self.__dict__.items():
+            if name == "lock":
+                clone.lock = threading.RLock()
+            elif name == "vecs":
+                clone.vecs = _VectorView(clone)
+            else:
+                setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+    def _alloc_row(self, chunk_id: UUID) -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._ids)
+            self._ids.append(None)
+            if row >= self._mat.shape[0]:
+                capacity = max(16, 2 * self._mat.shape[0])
+                grown = np.empty((capacity, self.dim), dtype=np.float32)
+                grown_i8 = np.empty((capacity, self.dim), dtype=np.int8)
+                grown_i8[:self._mat_i8.shape[0]] = self._mat_i8
+                grown[:self._mat.shape[0]] = self._mat
+                self._mat = grown
+                self._mat_i8 = grown_i8
+                norms = np.empty(capacity, dtype=np.float64)
+                norms[:self._norms.shape[0]] = self._norms
+                self._norms = norms
+                visited = np.zeros(capacity, dtype=np.uint8)
+                visited[:self._visited.shape[0]] = self._visited
+                self._visited = visited
+        self._ids[row] = chunk_id
+        self._row[chunk_id] = row
+        return row
+
+    def _release_row(self, chunk_id: UUID) -> None:
+        row = self._row.pop(chunk_id)
+        self._ids[row] = None
+        self._free.append(row)
+
+    def _signatures(self, vec: List[float]) -> List[int]:
+        """Per-table signatures from a single stacked-plane projection"""
+        if self.H > 64:
+            return [table.signature(vec) for table in self.tables]
+        np.matmul(self.all_planes, np.asarray(vec, dtype=np.float32), out=self._proj_buf)
+        proj = self._proj_buf.reshape(self.L, self.H)
+        if HAVE_NUMBA:
+            return [int(pack_signs(row)) for row in proj]
+        bits = proj >= 0.0
+        return [int(s) for s in bits.astype(np.uint64) @ self._weights]
+
     def add(self, chunk_id: UUID, vec: List[float]) -> None:
-        norm_vec = normalize(vec)
+        norm_vec = _normalize(vec)
+        if norm_vec is not None and norm_vec.shape[0] != self.dim:
+            # A mismatched dimension can't live in the shared (n, dim)
+            # matrix; treat it like a zero vector so an update drops the
+            # stale row instead of crashing after allocation
+            norm_vec = None
         with self.lock:
-            ov = self.vecs.get(chunk_id)
-            if ov is not None:
+            row = self._row.get(chunk_id)
+            if row is not None:
                 # Remove old vector from all tables
-                for table in self.tables:
-                    table.remove(chunk_id, ov)
-                # Remove from vecs if new vector is None (zero vector)
+                for table, sig in zip(self.tables, self._signatures(self._mat[row])):
+                    table.discard(sig, row)
+                # Drop the row if new vector is None (zero vector)
                 if norm_vec is None:
-                    self.vecs.pop(chunk_id, None)
+                    self._release_row(chunk_id)
                     return
-            
+
             # Add new vector if it's valid
             if norm_vec is not None:
-                self.vecs[chunk_id] = norm_vec
-                for table in self.tables:
-                    table.add(chunk_id, norm_vec)
-    
+                if row is None:
+                    row = self._alloc_row(chunk_id)
+                self._mat[row] = norm_vec
+                self._mat_i8[row] = _quantize_i8(norm_vec)
+                self._norms[row] = np.linalg.norm(norm_vec.astype(np.float64))
+                for table, sig in zip(self.tables, self._signatures(norm_vec)):
+                    table.insert(sig, row)
+
     def remove(self, chunk_id: UUID) -> None:
         with self.lock:
-            ov = self.vecs.pop(chunk_id, None)
-            if ov is not None:
-                for table in self.tables:
-                    table.remove(chunk_id, ov)
-    
-    def search(self, query: List[float], k: int = 10, metric: str = "cosine") -> List[Tuple[UUID, float]]:
-        norm_query = normalize(query)
+            row = self._row.get(chunk_id)
+            if row is not None:
+                for table, sig in zip(self.tables, self._signatures(self._mat[row])):
+                    table.discard(sig, row)
+                self._release_row(chunk_id)
+
+    def search(self, query: List[float], k: int = 10, metric: str = "cosine", min_collisions: int = 1) -> List[Tuple[UUID, float]]:
+        norm_query = _normalize(query)
         if norm_query is None:
             return []
         with self.lock:
-            candidates: Set[UUID] = set()
-            for table in self.tables:
-                b = table.buckets.get(table.signature(norm_query))
-                if b is not None:
-                    candidates.update(b)
+            # Dedup candidate rows across tables via the visited bitmap:
+            # a uint8 store per row instead of hashing 128-bit UUIDs.
+            # With min_collisions > 1 the bitmap doubles as a per-row
+            # collision counter (AND-amplification across tables).
+            touched: List[int] = []
+            if min_collisions <= 1:
+                for table, sig in zip(self.tables, self._signatures(norm_query)):
+                    bucket = table.buckets.get(sig)
+                    if bucket is None:
+                        continue
+                    new = bucket[self._visited[bucket] == 0]
+                    self._visited[new] = 1
+                    touched.extend(new.tolist())
+                gathered = touched
+            else:
+                for table, sig in zip(self.tables, self._signatures(norm_query)):
+                    bucket = table.buckets.get(sig)
+                    if bucket is None:
+                        continue
+                    new = bucket[self._visited[bucket] == 0]
+                    touched.extend(new.tolist())
+                    self._visited[bucket] += 1
+                gathered = [r for r in touched if self._visited[r] >= min_collisions]
+                if len(gathered) < k:
+                    # Too strict for this query; fall back to the plain union
+                    gathered = touched
             target = LSH_OVERSAMPLE * max(1, k)
             if LSH_MAX_CANDIDATES is not None:
                 target = min(target, LSH_MAX_CANDIDATES)
-            
-            cand_list = list(candidates)[:target] if len(candidates) > target else list(candidates)
-            vecs = self.vecs.copy()
-        
-        # If LSH doesn't find enough candidates, fall back to searching all vectors
-        if len(cand_list) < k and len(vecs) > len(cand_list):
-            # Add more candidates from all vectors to ensure we have enough to choose from
-            all_candidates = list(vecs.keys())
-            # Add candidates that weren't already included
-            for cand in all_candidates:
-                if cand not in candidates:
-                    cand_list.append(cand)
-                    if len(cand_list) >= k * 2:  # Get 2x more candidates for better results
-                        break
-        
-        # Get the appropriate similarity function
-        similarity_func = get_similarity_function(metric)
-        
-        # For non-normalized metrics, use original query; for cosine, use normalized
-        query_for_similarity = norm_query if metric == "cosine" else query
-        scores = [(cand, similarity_func(query_for_similarity, vec)) for cand in cand_list if (vec := vecs.get(cand)) is not None]
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:k]
+
+            cand_rows = gathered[:target] if len(gathered) > target else list(gathered)
+
+            # If LSH doesn't find enough candidates, fall back to searching all vectors
+            if len(cand_rows) < k and len(self._row) > len(cand_rows):
+                # Add candidates that weren't already included
+                for r in self._row.values():
+                    if not self._visited[r]:
+                        self._visited[r] = 1
+                        touched.append(r)
+                        cand_rows.append(r)
+                        if len(cand_rows) >= k * 2:  # Get 2x more candidates for better results
+                            break
+            if touched:
+                self._visited[touched] = 0
+
+            # Validate the metric before scoring
+            get_similarity_function(metric)
+
+            if not cand_rows:
+                return []
+            rows = np.asarray(cand_rows, dtype=np.intp)
+            if LSH_INT8_PRESCORE and metric == "cosine":
+                rows = self._prescore_i8(rows, norm_query, k)
+            ids = [self._ids[int(r)] for r in rows]
+            if None in ids:
+                # Guard against stale bucket entries for released rows
+                valid = [i for i, cid in enumerate(ids) if cid is not None]
+                rows = rows[valid]
+                ids = [ids[i] for i in valid]
+            scores = self._score_rows(rows, norm_query, query, metric)
+
+        if scores.size <= k:
+            order = np.argsort(-scores)
+        else:
+            # Partition out the top k, then sort only that slice
+            part = np.argpartition(-scores, k - 1)[:k]
+            order = part[np.argsort(-scores[part])]
+        return [(ids[i], float(scores[i])) for i in order]
+
+    def _score_rows(self, rows: np.ndarray, norm_query: np.ndarray, query: List[float], metric: str) -> np.ndarray:
+        """Score candidate rows against the query in one vectorized pass"""
+        if metric == "cosine":
+            # Stored vectors are ~unit norm in float32; divide by the exact
+            # norms so identical vectors score 1.0 to float64 precision
+            dots = self._row_dots(rows, norm_query)
+            denom = self._norms[rows] * float(np.linalg.norm(norm_query.astype(np.float64)))
+            return np.divide(dots, denom, out=np.zeros(rows.size), where=denom != 0)
+        if metric == "euclidean":
+            query64 = np.asarray(query, dtype=np.float64)
+            return 1.0 / (1.0 + np.linalg.norm(self._mat[rows].astype(np.float64) - query64, axis=1))
+        # dot_product
+        return self._row_dots(rows, np.asarray(query, dtype=np.float32))
+
+    def _prescore_i8(self, rows: np.ndarray, norm_query: np.ndarray, k: int) -> np.ndarray:
+        """Prune candidates by int8 dot product, keeping a pool for exact re-scoring"""
+        pool = max(LSH_INT8_RERANK_POOL, 4 * max(1, k))
+        if rows.size <= pool:
+            return rows
+        q_i8 = _quantize_i8(norm_query).astype(np.int32)
+        pre = self._mat_i8[rows].astype(np.int32) @ q_i8
+        keep = np.argpartition(-pre, pool - 1)[:pool]
+        return rows[keep]
+
+    def _row_dots(self, rows: np.ndarray, q: np.ndarray) -> np.ndarray:
+        """Row-vs-query dot products; numba kernel for large candidate sets"""
+        out = np.empty(rows.size)
+        if HAVE_NUMBA and rows.size >= LSH_NUMBA_MIN_ROWS:
+            score_rows_dot(self._mat, rows, q, out)
+        else:
+            out[:] = self._mat[rows].astype(np.float64) @ q.astype(np.float64)
+        return out
 
     def rebuild(self, items: List[Tuple[UUID, List[float]]]) -> None:
         with self.lock:
-            self.vecs.clear()
+            self._mat = np.empty((0, self.dim), dtype=np.float32)
+            self._mat_i8 = np.empty((0, self.dim), dtype=np.int8)
+            self._norms = np.empty(0, dtype=np.float64)
+            self._ids = []
+            self._row = {}
+            self._free = []
+            # Scratch must shrink with the storage it shadows, or the next
+            # _alloc_row growth copies a stale oversized bitmap and crashes
+            self._visited = np.zeros(0, dtype=np.uint8)
             for table in self.tables:
                 table.buckets.clear()
-            for cid, vec in items:
-                norm_vec = normalize(vec)
-                if norm_vec is not None:
-                    self.vecs[cid] = norm_vec
-                    for table in self.tables:
-                        table.add(cid, norm_vec)
+            if not items:
+                return
+
+            # Last write wins for repeated ids, matching what repeated
+            # add() calls produce; both paths below assume unique ids
+            if len(items) > 1:
+                items = list(dict(items).items())
+
+            try:
+                V = np.asarray([vec for _, vec in items], dtype=np.float32)
+            except ValueError:
+                V = None
+            if V is None or V.ndim != 2 or V.shape[1] != self.dim or self.H > 64:
+                # Ragged/odd-shaped input or wide signatures: insert
+                # item by item, skipping vectors that don't fit the
+                # (n, dim) storage — the same ones add() would drop
+                for cid, vec in items:
+                    norm_vec = _normalize(vec)
+                    if norm_vec is not None and norm_vec.shape[0] == self.dim:
+                        row = self._alloc_row(cid)
+                        self._mat[row] = norm_vec
+                        self._mat_i8[row] = _quantize_i8(norm_vec)
+                        self._norms[row] = np.linalg.norm(norm_vec.astype(np.float64))
+                        for table, sig in zip(self.tables, self._signatures(norm_vec)):
+                            table.insert(sig, row)
+                return
+
+            # Bulk path: normalize all rows at once, then one GEMM against
+            # the stacked hyperplanes instead of one matvec per item
+            norms = np.linalg.norm(V, axis=1)
+            # Same squared-norm cutoff as _normalize so the bulk and
+            # per-item paths accept exactly the same vectors
+            keep = (norms * norms) >= LSH_EPS_SQ
+            V = V[keep] / norms[keep, None]
+            n = V.shape[0]
+            for cid, kept in zip((cid for cid, _ in items), keep):
+                if kept:
+                    self._alloc_row(cid)
+            self._mat[:n] = V
+            self._mat_i8[:n] = _quantize_i8(V)
+            self._norms[:n] = np.linalg.norm(self._mat[:n].astype(np.float64), axis=1)
+
+            proj = self._mat[:n] @ self.all_planes.T
+            sigs = (proj >= 0.0).reshape(n, self.L, self.H).astype(np.uint64) @ self._weights
+            for t_idx, table in enumerate(self.tables):
+                col = sigs[:, t_idx]
+                # Stable argsort groups rows per signature in ascending order
+                order = np.argsort(col, kind="stable")
+                bounds = np.flatnonzero(np.diff(col[order])) + 1
+                for group in np.split(order, bounds):
+                    table.buckets[int(col[group[0]])] = group.astype(np.intp)
                 
         
\ No newline at end of file
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Optional, Iterable, Tuple, List
+from typing import Callable, Dict, Optional, Iterable, Tuple, List
 from uuid import UUID
 import threading
 
@@ -11,13 +11,40 @@ from vector_db_api.indexing.ivf import IVFIndex
 from vector_db_api.models.indexing import IndexType
 from vector_db_api.models.entities import Library
 
+# index type -> constructor; one dict lookup instead of a string-compare chain
+_INDEX_FACTORIES: Dict[str, Callable[[IndexType, int], BaseIndex]] = {
+    "flat": lambda config, dim: FlatIndex(),
+    "lsh": lambda config, dim: LSHIndex(
+        dim=dim,
+        num_tables=getattr(config, "lsh_num_tables", 8) or 8,
+        hyperplanes_per_table=getattr(config, "lsh_hyperplanes_per_table", 16) or 16,
+    ),
+    "ivf": lambda config, dim: IVFIndex(
+        dim=dim,
+        num_centroids=getattr(config, "ivf_num_centroids", 64) or 64,
+        nprobe=getattr(config, "ivf_nprobe", 4) or 4,
+    ),
+}
+
+REGISTRY_LOCK_STRIPES: int = 16 # power of two; lock stripe count for get_or_create
+
 class IndexRegistry:
     def __init__(self) -> None:
         self.registry: Dict[UUID, BaseIndex] = {}
-        self.lock = threading.Lock()
+        # Striped locks: get_or_create for independent libraries never
+        # contends on one global lock. Plain dict get/set/pop are atomic
+        # in CPython, so reads, swaps and removals need no lock at all.
+        self._stripes: List[threading.Lock] = [threading.Lock() for _ in range(REGISTRY_LOCK_STRIPES)]
+
+    def _lock_for(self, lib_id: UUID) -> threading.Lock:
+        return self._stripes[hash(lib_id) & (REGISTRY_LOCK_STRIPES - 1)]
 
     def get_or_create(self, lib: Library) -> BaseIndex:
-        with self.lock:
+        # Double-checked: lock-free fast path, then recheck under the stripe
+        index = self.registry.get(lib.id)
+        if index is not None:
+            return index
+        with self._lock_for(lib.id):
             index = self.registry.get(lib.id)
             if index is not None:
                 return index
@@ -27,30 +54,17 @@ class IndexRegistry:
     
     def get(self, lib_id: UUID) -> Optional[BaseIndex]:
         # No deep copy: callers treat this as read-only
-        with self.lock:
-            return self.registry.get(lib_id)
+        return self.registry.get(lib_id)
 
     def swap(self, lib_id: UUID, new_index: BaseIndex) -> None:
-        with self.lock:
-            self.registry[lib_id] = new_index
+        self.registry[lib_id] = new_index
         
     def remove(self, lib_id: UUID) -> None:
-        with self.lock:
-            self.registry.pop(lib_id, None)
+        self.registry.pop(lib_id, None)
 
     # helper function to create an index based on the index type
     def create_index(self, index_config: IndexType, embedding_dim: int) -> BaseIndex:
-        if index_config.type == "flat":
-            return FlatIndex()
-        
-        if index_config.type == "lsh":
-            L = getattr(index_config, "lsh_num_tables", 8) or 8
-            H = getattr(index_config, "lsh_hyperplanes_per_table", 16) or 16
-            return LSHIndex(dim=embedding_dim, num_tables=L, hyperplanes_per_table=H)
-
-        if index_config.type == "ivf":
-            K = getattr(index_config, "ivf_num_centroids", 64) or 64
-            NP = getattr(index_config, "ivf_nprobe", 4) or 4
-            return IVFIndex(dim=embedding_dim, num_centroids=K, nprobe=NP)
-
-        raise ValueError(f"Unsupported index type: {index_config.type}")
\ No newline at end of file
+        factory = _INDEX_FACTORIES.get(index_config.type)
+        if factory is None:
+            raise ValueError(f"Unsupported index type: {index_config.type}")
+        return factory(index_config, embedding_dim)
\ No newline at end of file
@@ -24,6 +24,18 @@ class Chunk(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     version: int = 1 # update on write
 
+    # Short-circuit on id mismatch: ids are unique, so membership scans
+    # skip the full field comparison (the embedding list dominates that
+    # cost) for non-matching entries; id-equal objects still compare
+    # every field, so distinct versions stay distinguishable
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, type(self)) and self.id != other.id:
+            return False
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
 
 class Document(BaseModel):
 
@@ -37,6 +49,14 @@ class Document(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     version: int = 1
 
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, type(self)) and self.id != other.id:
+            return False
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
 
 class Library(BaseModel):
 
@@ -1,16 +1,18 @@
-from typing import Dict, List, Optional, Iterable
+from typing import Callable, Dict, List, Optional, Iterable
 from uuid import UUID
 from datetime import datetime
 from vector_db_api.models.entities import Chunk
 
 class ChunkRepo:
-    def __init__(self) -> None:
+    def __init__(self, time_func: Callable[[], datetime] = datetime.utcnow) -> None:
         self.chunks: Dict[UUID, Chunk] = {}
         self.chunks_by_document: Dict[UUID, List[UUID]] = {}
         self.chunks_by_library: Dict[UUID, List[UUID]] = {}
+        # Injectable clock so tests can drive timestamps deterministically
+        self._now = time_func
     
     def add(self, chunk: Chunk) -> None:
-        now = datetime.utcnow()
+        now = self._now()
         chunk.created_at = now
         chunk.updated_at = now
         self.chunks[chunk.id] = chunk
@@ -18,8 +20,17 @@ class ChunkRepo:
         self.chunks_by_library.setdefault(chunk.library_id, []).append(chunk.id)
     
     def add_bulk(self, chunks: Iterable[Chunk]) -> None:
+        # Single timestamp and single pass over both secondary indexes
+        now = self._now()
         for chunk in chunks:
-            self.add(chunk)
+            chunk.created_at = now
+            chunk.updated_at = now
+            self.chunks[chunk.id] = chunk
+            self.chunks_by_document.setdefault(chunk.document_id, []).append(chunk.id)
+            self.chunks_by_library.setdefault(chunk.library_id, []).append(chunk.id)
+    
+    def size(self) -> int:
+        return len(self.chunks)
     
     def get(self, chunk_id: UUID) -> Optional[Chunk]:
         chunk = self.chunks.get(chunk_id)
@@ -55,7 +66,7 @@ class ChunkRepo:
             self.chunks_by_library.setdefault(chunk.library_id, []).append(chunk.id)
         
         chunk.version = expected_version + 1
-        chunk.updated_at = datetime.utcnow()
+        chunk.updated_at = self._now()
         self.chunks[chunk.id] = chunk
         return True
     
@@ -1,20 +1,25 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
 from vector_db_api.models.entities import Document
 
 class DocumentRepo:
-    def __init__(self) -> None:
+    def __init__(self, time_func: Callable[[], datetime] = datetime.utcnow) -> None:
         self.documents: Dict[UUID, Document] = {}
         self.documents_by_library: Dict[UUID, List[UUID]] = {}
+        # Injectable clock so tests can drive timestamps deterministically
+        self._now = time_func
     
     def add(self, doc: Document) -> None:
-        now = datetime.utcnow()
+        now = self._now()
         doc.created_at = now
         doc.updated_at = now
         self.documents[doc.id] = doc
         self.documents_by_library.setdefault(doc.library_id, []).append(doc.id)
     
+    def size(self) -> int:
+        return len(self.documents)
+    
     def get(self, doc_id: UUID) -> Optional[Document]:
         doc = self.documents.get(doc_id)
         return doc.model_copy(deep=True) if doc else None
@@ -60,7 +65,7 @@ class DocumentRepo:
             self.documents_by_library.setdefault(doc.library_id, []).append(doc.id)
         
         doc.version = expected_version + 1
-        doc.updated_at = datetime.utcnow()
+        doc.updated_at = self._now()
         self.documents[doc.id] = doc
         return True
     
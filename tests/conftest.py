@@ -3,18 +3,26 @@ Pytest configuration and shared fixtures
 """
 
 import pytest
-import sys
-import os
 from uuid import uuid4
 
-# Add src to Python path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from fastapi import FastAPI
 
+from vector_db_api.api.errors import register_exception_handlers
 from vector_db_api.models.entities import Library, Document, Chunk
 from vector_db_api.models.metadata import LibraryMetadata, DocumentMetadata, ChunkMetadata
 from vector_db_api.models.indexing import IndexType
 
 
+@pytest.fixture(scope="session")
+def configured_app_factory():
+    """Factory for FastAPI apps with exception handlers already wired"""
+    def factory() -> FastAPI:
+        app = FastAPI()
+        register_exception_handlers(app)
+        return app
+    return factory
+
+
 @pytest.fixture
 def sample_library():
     """Create a sample library for testing"""
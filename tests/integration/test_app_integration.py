@@ -8,8 +8,6 @@ import psutil
 import os
 from fastapi.testclient import TestClient
 
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from vector_db_api.main import app
 
@@ -0,0 +1,136 @@
+"""
+Scaling regression tests for ChunkRepo lookups
+
+list_by_library and list_by_document are backed by dict indexes and must
+stay O(limit) as the repo grows. These tests time the lookup at two repo
+sizes and fail if runtime grows close to linearly with chunk count —
+the pathology a naive list-scan implementation would reintroduce.
+"""
+
+import time
+from uuid import uuid4
+
+import pytest
+
+from vector_db_api.repos.chunks import ChunkRepo
+from vector_db_api.models.entities import Chunk
+
+_EMB = [0.1, 0.2, 0.3, 0.4, 0.5]
+_SMALL_N = 1_000
+_LARGE_N = 20_000
+_REPEATS = 50
+
+
+def _raw_chunk(**kw) -> Chunk:
+    # model_construct skips validation; safe because we own every input
+    # here and the builder would otherwise be dominated by pydantic cost
+    return Chunk.model_construct(**kw)
+
+
+class _FastChunk:
+    """__slots__ stand-in for Chunk: same attribute surface, no pydantic
+
+    ChunkRepo only reads attributes and calls model_copy on stored
+    objects, so any duck-typed chunk works; this one halves per-object
+    memory for the large builds.
+    """
+    __slots__ = ("id", "library_id", "document_id", "text", "position",
+                 "embedding", "metadata", "version", "created_at", "updated_at")
+
+    def __init__(self, **kw):
+        kw.setdefault("id", uuid4())
+        kw.setdefault("metadata", None)
+        kw.setdefault("version", 1)
+        kw.setdefault("created_at", None)
+        kw.setdefault("updated_at", None)
+        for k, v in kw.items():
+            setattr(self, k, v)
+
+    def model_copy(self, deep: bool = False) -> "_FastChunk":
+        return _FastChunk(**{s: getattr(self, s) for s in self.__slots__})
+
+
+_FACTORIES = [_raw_chunk, _FastChunk]
+
+
+def _build_repo(n: int, factory=_raw_chunk):
+    repo = ChunkRepo()
+    lib_id = uuid4()
+    doc_id = uuid4()
+    repo.add_bulk([
+        factory(
+            library_id=lib_id,
+            document_id=doc_id,
+            text=f"chunk {i}",
+            position=i,
+            embedding=_EMB,
+        )
+        for i in range(n)
+    ])
+    return repo, lib_id, doc_id
+
+
+def _time_lookup(fn, arg) -> float:
+    # Best-of-repeats: robust against scheduler noise
+    best = float("inf")
+    for _ in range(_REPEATS):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.slow
+def test_list_by_library_scales_sublinearly():
+    """list_by_library must not degrade to a full scan of the repo"""
+    small_repo, small_lib, _ = _build_repo(_SMALL_N)
+    large_repo, large_lib, _ = _build_repo(_LARGE_N)
+
+    small_time = _time_lookup(small_repo.list_by_library, small_lib)
+    large_time = _time_lookup(large_repo.list_by_library, large_lib)
+
+    # A 20x bigger repo should cost nowhere near 20x per lookup
+    assert large_time < 10 * max(small_time, 1e-7)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("factory", _FACTORIES)
+def test_add_bulk_large(factory):
+    """add_bulk at N=10k must stay well clear of quadratic insertion"""
+    n = 10_000
+    repo = ChunkRepo()
+    lib_id = uuid4()
+    doc_id = uuid4()
+    chunks = [
+        factory(
+            library_id=lib_id,
+            document_id=doc_id,
+            text=f"chunk {i}",
+            position=i,
+            embedding=_EMB,
+        )
+        for i in range(n)
+    ]
+
+    t0 = time.perf_counter_ns()
+    repo.add_bulk(chunks)
+    dt = (time.perf_counter_ns() - t0) / 1e9
+
+    assert dt < 1.0  # fails loudly on O(n^2) insertion
+    assert repo.size() == n
+    listed = repo.list_by_library(lib_id, limit=n)
+    assert len(listed) == n
+    # Behavioral equivalence: listing yields the same ids either way
+    assert {c.id for c in listed} == {c.id for c in chunks}
+
+
+@pytest.mark.slow
+def test_list_by_document_scales_sublinearly():
+    """list_by_document must not degrade to a full scan of the repo"""
+    small_repo, _, small_doc = _build_repo(_SMALL_N)
+    large_repo, _, large_doc = _build_repo(_LARGE_N)
+
+    small_time = _time_lookup(small_repo.list_by_document, small_doc)
+    large_time = _time_lookup(large_repo.list_by_document, large_doc)
+
+    assert large_time < 10 * max(small_time, 1e-7)
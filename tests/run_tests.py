@@ -11,11 +11,8 @@ from pathlib import Path
 def run_tests(test_path=None, verbose=False, coverage=False, markers=None, is_unit=False, is_integration=False):
     """Run tests with pytest"""
     
-    # Add src to Python path
-    src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
-    if src_path not in sys.path:
-        sys.path.insert(0, src_path)
-    
+    # src resolution is handled by the pythonpath setting in pyproject.toml
+
     # Build pytest command
     cmd = ['python3', '-m', 'pytest']
     
@@ -7,10 +7,6 @@ from abc import ABC, abstractmethod
 from uuid import uuid4
 from typing import List, Tuple
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
-
 from vector_db_api.indexing.base import BaseIndex
 
 
@@ -2,32 +2,56 @@
 Unit tests for FlatIndex
 """
 
+import os
+
+import numpy as np
 import pytest
-from uuid import uuid4
+from uuid import UUID, uuid4
 from typing import List, Tuple
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
-
 from vector_db_api.indexing.flat import FlatIndex
 
 
+def _fresh_uuids(n):
+    """Generate n random UUIDs from a single urandom read"""
+    buf = os.urandom(16 * n)
+    return [UUID(bytes=buf[i * 16:(i + 1) * 16], version=4) for i in range(n)]
+
+
+# Shared ids/vectors for the module-scoped read-only index below
+CHUNK_ID1, CHUNK_ID2, CHUNK_ID3 = _fresh_uuids(3)
+VECTOR1 = np.tile([0.1, 0.2, 0.3], 43)[:128].tolist()
+VECTOR2 = np.tile([0.4, 0.5, 0.6], 43)[:128].tolist()
+VECTOR3 = np.tile([0.7, 0.8, 0.9], 43)[:128].tolist()
+QUERY_VECTOR = VECTOR1  # Similar to VECTOR1
+REPLACEMENT_VECTOR = np.tile([0.9, 0.8, 0.7], 43)[:128].tolist()
+
+
+@pytest.fixture(scope="module")
+def readonly_index():
+    """A populated FlatIndex shared by tests that only read from it"""
+    index = FlatIndex()
+    index.rebuild([
+        (CHUNK_ID1, VECTOR1),
+        (CHUNK_ID2, VECTOR2),
+        (CHUNK_ID3, VECTOR3),
+    ])
+    return index
+
+
 class TestFlatIndex:
     """Test cases for FlatIndex"""
     
     def setup_method(self):
         """Set up test fixtures before each test method"""
         self.index = FlatIndex()
-        self.chunk_id1 = uuid4()
-        self.chunk_id2 = uuid4()
-        self.chunk_id3 = uuid4()
-        
-        # Sample vectors (128 dimensions)
-        self.vector1 = [0.1, 0.2, 0.3] * 42 + [0.1, 0.2]
-        self.vector2 = [0.4, 0.5, 0.6] * 42 + [0.4, 0.5]
-        self.vector3 = [0.7, 0.8, 0.9] * 42 + [0.7, 0.8]
-        self.query_vector = [0.1, 0.2, 0.3] * 42 + [0.1, 0.2]  # Similar to vector1
+        self.chunk_id1, self.chunk_id2, self.chunk_id3 = _fresh_uuids(3)
+        
+        # Sample vectors (128 dimensions), precomputed once at module scope
+        self.vector1 = VECTOR1
+        self.vector2 = VECTOR2
+        self.vector3 = VECTOR3
+        self.query_vector = QUERY_VECTOR
     
     def test_add_vector(self):
         """Test adding a vector to the index"""
@@ -55,7 +79,7 @@ class TestFlatIndex:
         """Test updating an existing vector"""
         # Arrange
         self.index.add(self.chunk_id1, self.vector1)
-        new_vector = [0.9, 0.8, 0.7] * 42 + [0.9, 0.8]
+        new_vector = REPLACEMENT_VECTOR
         
         # Act
         self.index.update(self.chunk_id1, new_vector)
@@ -67,7 +91,7 @@ class TestFlatIndex:
     def test_update_nonexistent_vector(self):
         """Test updating a vector that doesn't exist"""
         # Arrange
-        new_vector = [0.9, 0.8, 0.7] * 42 + [0.9, 0.8]
+        new_vector = REPLACEMENT_VECTOR
         
         # Act
         self.index.update(self.chunk_id1, new_vector)
@@ -124,68 +148,53 @@ class TestFlatIndex:
         assert results[0][0] == self.chunk_id1
         assert abs(results[0][1] - 1.0) < 1e-10  # Perfect similarity (same vector)
     
-    def test_search_multiple_vectors(self):
+    def test_search_multiple_vectors(self, readonly_index):
         """Test searching with multiple vectors in the index"""
-        # Arrange
-        self.index.add(self.chunk_id1, self.vector1)
-        self.index.add(self.chunk_id2, self.vector2)
-        self.index.add(self.chunk_id3, self.vector3)
-        
         # Act
-        results = self.index.search(self.query_vector, k=3)
-        
+        results = readonly_index.search(QUERY_VECTOR, k=3)
+
         # Assert
         assert len(results) == 3
         # Results should be sorted by similarity (descending)
-        assert results[0][0] == self.chunk_id1  # Most similar (same vector)
+        assert results[0][0] == CHUNK_ID1  # Most similar (same vector)
         assert abs(results[0][1] - 1.0) < 1e-10  # Perfect similarity
-        
+
         # Verify sorting
         for i in range(len(results) - 1):
             assert results[i][1] >= results[i + 1][1]
-    
-    def test_search_with_k_limit(self):
+
+    def test_search_with_k_limit(self, readonly_index):
         """Test searching with k limit smaller than available vectors"""
-        # Arrange
-        self.index.add(self.chunk_id1, self.vector1)
-        self.index.add(self.chunk_id2, self.vector2)
-        self.index.add(self.chunk_id3, self.vector3)
-        
         # Act
-        results = self.index.search(self.query_vector, k=2)
-        
+        results = readonly_index.search(QUERY_VECTOR, k=2)
+
         # Assert
         assert len(results) == 2
-        assert results[0][0] == self.chunk_id1  # Most similar
-        assert results[1][0] in [self.chunk_id2, self.chunk_id3]  # Second most similar
-    
-    def test_search_with_k_larger_than_vectors(self):
+        assert results[0][0] == CHUNK_ID1  # Most similar
+        assert results[1][0] in [CHUNK_ID2, CHUNK_ID3]  # Second most similar
+
+    def test_search_with_k_larger_than_vectors(self, readonly_index):
         """Test searching with k larger than available vectors"""
-        # Arrange
-        self.index.add(self.chunk_id1, self.vector1)
-        self.index.add(self.chunk_id2, self.vector2)
-        
         # Act
-        results = self.index.search(self.query_vector, k=5)
-        
+        results = readonly_index.search(QUERY_VECTOR, k=5)
+
         # Assert
-        assert len(results) == 2  # Only 2 vectors available
-        assert results[0][0] == self.chunk_id1
-        assert results[1][0] == self.chunk_id2
+        assert len(results) == 3  # Only 3 vectors available
+        assert results[0][0] == CHUNK_ID1
     
     def test_search_similarity_scores(self):
         """Test that search returns correct similarity scores"""
         # Arrange
         # Create vectors with known similarities
-        identical_vector = [1.0, 0.0, 0.0] * 42 + [1.0, 0.0]
-        orthogonal_vector = [0.0, 1.0, 0.0] * 42 + [0.0, 1.0]
-        opposite_vector = [-1.0, 0.0, 0.0] * 42 + [-1.0, 0.0]
+        identical_vector = np.tile([1.0, 0.0, 0.0], 43)[:128].tolist()
+        orthogonal_vector = np.tile([0.0, 1.0, 0.0], 43)[:128].tolist()
+        opposite_vector = np.tile([-1.0, 0.0, 0.0], 43)[:128].tolist()
         
         self.index.add(self.chunk_id1, identical_vector)
         self.index.add(self.chunk_id2, orthogonal_vector)
         self.index.add(self.chunk_id3, opposite_vector)
         
-        query = [1.0, 0.0, 0.0] * 42 + [1.0, 0.0]
+        query = identical_vector
         
         # Act
         results = self.index.search(query, k=3)
@@ -218,7 +227,7 @@ class TestFlatIndex:
         # New items for rebuild
         new_items = [
             (self.chunk_id3, self.vector3),
-            (uuid4(), [0.1, 0.1, 0.1] * 42 + [0.1, 0.1])
+            (uuid4(), np.tile(0.1, 128).tolist())
         ]
         
         # Act
@@ -353,13 +362,12 @@ class TestFlatIndex:
     def test_large_number_of_vectors(self):
         """Test performance with a large number of vectors"""
         # Arrange
-        vectors = []
-        for i in range(100):
-            chunk_id = uuid4()
-            vector = [float(i % 10) / 10.0] * 128
-            vectors.append((chunk_id, vector))
-            self.index.add(chunk_id, vector)
-        
+        items = [
+            (chunk_id, [float(i % 10) / 10.0] * 128)
+            for i, chunk_id in enumerate(_fresh_uuids(100))
+        ]
+        self.index.rebuild(items)  # Single bulk insert instead of 100 add() calls
+
         # Act
         results = self.index.search([0.0] * 128, k=10)
         
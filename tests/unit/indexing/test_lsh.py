@@ -2,16 +2,21 @@
 Unit tests for LSHIndex
 """
 
+import copy
+import random
+
 import pytest
 from uuid import uuid4
 from typing import List, Tuple
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
 
 from vector_db_api.indexing.lsh import LSHIndex, LSHTable
 
+# Built once per module; tests deepcopy these instead of regenerating
+# the Gaussian hyperplanes for every method
+_TABLE_PROTOTYPE = LSHTable(128, 16, random.Random(42))
+_INDEX_PROTOTYPE = LSHIndex(dim=128, num_tables=4, hyperplanes_per_table=8, seed=42)
+
 
 class TestLSHTable:
     """Test cases for LSHTable"""
@@ -20,8 +25,7 @@ class TestLSHTable:
         """Set up test fixtures before each test method"""
         self.dim = 128
         self.hyperplanes = 16
-        import random
-        self.table = LSHTable(self.dim, self.hyperplanes, random.Random(42))
+        self.table = copy.deepcopy(_TABLE_PROTOTYPE)
         self.chunk_id = uuid4()
         self.vector = [0.1, 0.2, 0.3] * 42 + [0.1, 0.2]
     
@@ -131,12 +135,7 @@ class TestLSHIndex:
         self.dim = 128
         self.num_tables = 4
         self.hyperplanes_per_table = 8
-        self.index = LSHIndex(
-            dim=self.dim,
-            num_tables=self.num_tables,
-            hyperplanes_per_table=self.hyperplanes_per_table,
-            seed=42
-        )
+        self.index = copy.deepcopy(_INDEX_PROTOTYPE)
         
         self.chunk_id1 = uuid4()
         self.chunk_id2 = uuid4()
@@ -173,11 +172,12 @@ class TestLSHIndex:
         norm_vector = self.index.vecs[self.chunk_id1]
         assert len(norm_vector) == self.dim
         
-        # Check that vector is added to all tables
+        # Check that vector's row is added to all tables
+        row = self.index._row[self.chunk_id1]
         for table in self.index.tables:
             sig = table.signature(norm_vector)
             if sig in table.buckets:
-                assert self.chunk_id1 in table.buckets[sig]
+                assert row in table.buckets[sig]
     
     def test_add_multiple_vectors(self):
         """Test adding multiple vectors to LSH index"""
@@ -251,6 +251,43 @@ class TestLSHIndex:
         assert results[0][0] == self.chunk_id1
         assert abs(results[0][1] - 1.0) < 1e-10  # Perfect similarity (same vector)
     
+    def test_search_with_min_collisions(self):
+        """Test searching with AND-amplification across tables"""
+        # Arrange
+        self.index.add(self.chunk_id1, self.vector1)
+        self.index.add(self.chunk_id2, self.vector2)
+        self.index.add(self.chunk_id3, self.vector3)
+
+        # Act - an identical vector collides in every table
+        results = self.index.search(self.query_vector, k=1, min_collisions=self.index.L)
+
+        # Assert
+        assert results[0][0] == self.chunk_id1
+        assert abs(results[0][1] - 1.0) < 1e-10
+
+    def test_search_with_int8_prescore(self, monkeypatch):
+        """Test that int8 pre-scoring still returns the exact best match"""
+        # Arrange
+        import vector_db_api.indexing.lsh as lsh_module
+        monkeypatch.setattr(lsh_module, "LSH_INT8_PRESCORE", True)
+
+        # Fill the index with neighbors of the query: close enough to share
+        # buckets (so the pruning path triggers) but with similarity margins
+        # wider than int8 quantization noise
+        rng = random.Random(7)
+        for _ in range(34):
+            noisy = [x + rng.uniform(-0.1, 0.1) for x in self.vector1]
+            self.index.add(uuid4(), noisy)
+        self.index.add(self.chunk_id1, self.vector1)
+
+        # Act (k chosen so oversampling keeps every candidate but the
+        # candidate count still exceeds the rerank pool)
+        results = self.index.search(self.query_vector, k=6)
+
+        # Assert
+        assert results[0][0] == self.chunk_id1
+        assert abs(results[0][1] - 1.0) < 1e-10  # Exact re-scoring keeps precision
+
     def test_search_multiple_vectors(self):
         """Test searching with multiple vectors in the index"""
         # Arrange
@@ -351,6 +388,42 @@ class TestLSHIndex:
         assert self.chunk_id2 in self.index.vecs
         assert self.chunk_id3 in self.index.vecs
     
+    def test_rebuild_after_growth(self):
+        """Test rebuilding an index whose storage already grew past 16 rows"""
+        # Arrange: enough vectors that the row storage has been resized
+        for i in range(20):
+            self.index.add(uuid4(), [0.1 + 0.01 * i] * self.dim)
+        items = [
+            (self.chunk_id1, self.vector1),
+            (self.chunk_id2, self.vector2)
+        ]
+        
+        # Act
+        self.index.rebuild(items)
+        
+        # Assert
+        assert len(self.index.vecs) == 2
+        results = self.index.search(self.query_vector, k=2)
+        assert results[0][0] == self.chunk_id1
+    
+    def test_rebuild_with_duplicate_ids(self):
+        """Test that rebuild keeps one row per id, last write winning"""
+        # Arrange: chunk_id1 appears twice with different vectors
+        items = [
+            (self.chunk_id1, self.vector1),
+            (self.chunk_id2, self.vector2),
+            (self.chunk_id1, self.vector3)
+        ]
+        
+        # Act
+        self.index.rebuild(items)
+        
+        # Assert
+        assert len(self.index.vecs) == 2
+        results = self.index.search(self.vector3, k=10)
+        result_ids = [chunk_id for chunk_id, _ in results]
+        assert result_ids.count(self.chunk_id1) == 1
+    
     def test_search_after_rebuild(self):
         """Test searching after rebuild"""
         # Arrange
@@ -0,0 +1,57 @@
+"""
+Shared fixtures for repository tests
+"""
+
+import pytest
+from uuid import UUID
+
+from vector_db_api.models.entities import Chunk, Document, Library
+from vector_db_api.models.metadata import ChunkMetadata, DocumentMetadata, LibraryMetadata
+from vector_db_api.models.indexing import IndexType
+
+# Frozen ids shared by the session templates; tests needing a distinct id
+# still mint their own with uuid4()
+_LIB_ID = UUID("00000000-0000-0000-0000-000000000001")
+_DOC_ID = UUID("00000000-0000-0000-0000-000000000002")
+
+# Immutable tag tuple; the schema wants List[str], so callers pass list(_TAGS)
+_TAGS = ("test", "unit")
+
+
+@pytest.fixture(scope="session")
+def chunk_template():
+    """Canonical chunk built and validated once; tests deepcopy it"""
+    return Chunk(
+        library_id=_LIB_ID,
+        document_id=_DOC_ID,
+        text="This is a test chunk for unit testing.",
+        position=0,
+        embedding=[0.1, 0.2, 0.3, 0.4, 0.5],
+        metadata=ChunkMetadata(
+            token_count=8,
+            tags=list(_TAGS)
+        )
+    )
+
+
+@pytest.fixture(scope="session")
+def document_template():
+    """Canonical document built and validated once; tests deepcopy it"""
+    return Document(
+        library_id=_LIB_ID,
+        metadata=DocumentMetadata(
+            title="Test Document",
+            summary="A test document for unit tests"
+        )
+    )
+
+
+@pytest.fixture(scope="session")
+def library_template():
+    """Canonical library built and validated once; tests deepcopy it"""
+    return Library(
+        name="Test Library",
+        embedding_dim=128,
+        metadata=LibraryMetadata(description="Test library for unit tests"),
+        index_config=IndexType(type="flat")
+    )
@@ -2,39 +2,38 @@
 Unit tests for Chunk repository
 """
 
+import copy
+
 import pytest
 from uuid import uuid4
 from datetime import datetime
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
-
 from vector_db_api.repos.chunks import ChunkRepo
 from vector_db_api.models.entities import Chunk
 from vector_db_api.models.metadata import ChunkMetadata
 
+# Shared embedding constants: immutable tuples built once per module
+# instead of reallocating float lists inside every test
+_EMB_A = (0.1, 0.2, 0.3, 0.4, 0.5)
+_EMB_B = (0.6, 0.7, 0.8, 0.9, 1.0)
+_EMB_C = (0.9, 0.8, 0.7, 0.6, 0.5)
+
 
 class TestChunkRepo:
     """Test cases for Chunk repository"""
     
-    def setup_method(self):
-        """Set up test fixtures before each test method"""
+    @pytest.fixture(autouse=True)
+    def _setup(self, chunk_template):
+        """Deepcopy the session template instead of rebuilding models per test"""
         self.repo = ChunkRepo()
-        self.library_id = uuid4()
-        self.document_id = uuid4()
-        self.test_embedding = [0.1, 0.2, 0.3, 0.4, 0.5]
-        self.test_chunk = Chunk(
-            library_id=self.library_id,
-            document_id=self.document_id,
-            text="This is a test chunk for unit testing.",
-            position=0,
-            embedding=self.test_embedding,
-            metadata=ChunkMetadata(
-                token_count=8,
-                tags=["test", "unit"]
-            )
-        )
+        self.test_chunk = copy.deepcopy(chunk_template)
+        self.library_id = self.test_chunk.library_id
+        self.document_id = self.test_chunk.document_id
+        self.test_embedding = self.test_chunk.embedding
+    
+    def _mk(self, **overrides):
+        """Clone the prototype chunk with overrides, skipping re-validation"""
+        return self.test_chunk.model_copy(update={"id": uuid4(), **overrides}, deep=False)
     
     def test_add_chunk(self):
         """Test adding a chunk to the repository"""
@@ -42,8 +41,8 @@ class TestChunkRepo:
         self.repo.add(self.test_chunk)
         
         # Assert
-        assert len(self.repo.chunks) == 1
-        assert self.test_chunk.id in self.repo.chunks
+        assert self.repo.size() == 1
+        assert self.repo.get(self.test_chunk.id) is not None
     
     def test_get_chunk_by_id(self):
         """Test retrieving a chunk by ID"""
@@ -72,67 +71,49 @@ class TestChunkRepo:
     def test_list_chunks_by_library(self):
         """Test listing chunks by library"""
         # Arrange
-        chunk2 = Chunk(
-            library_id=self.library_id,
-            document_id=self.document_id,
-            text="Second test chunk",
-            position=1,
-            embedding=[0.6, 0.7, 0.8, 0.9, 1.0]
-        )
-        self.repo.add(self.test_chunk)
-        self.repo.add(chunk2)
+        chunk2 = self._mk(text="Second test chunk", position=1, embedding=list(_EMB_B))
+        self.repo.add_bulk([self.test_chunk, chunk2])
         
         # Act
         chunks = self.repo.list_by_library(self.library_id)
         
         # Assert
         assert len(chunks) == 2
-        assert self.test_chunk in chunks
-        assert chunk2 in chunks
+        ids = {c.id for c in chunks}
+        assert self.test_chunk.id in ids
+        assert chunk2.id in ids
     
     def test_list_chunks_by_specific_library(self):
         """Test listing chunks by specific library ID"""
         # Arrange
         other_library_id = uuid4()
-        chunk2 = Chunk(
-            library_id=other_library_id,
-            document_id=self.document_id,
-            text="Other library chunk",
-            position=0,
-            embedding=[0.6, 0.7, 0.8, 0.9, 1.0]
-        )
-        self.repo.add(self.test_chunk)
-        self.repo.add(chunk2)
+        chunk2 = self._mk(library_id=other_library_id, text="Other library chunk", embedding=list(_EMB_B))
+        self.repo.add_bulk([self.test_chunk, chunk2])
         
         # Act
         library_chunks = self.repo.list_by_library(self.library_id)
         
         # Assert
         assert len(library_chunks) == 1
-        assert self.test_chunk in library_chunks
-        assert chunk2 not in library_chunks
+        ids = {c.id for c in library_chunks}
+        assert self.test_chunk.id in ids
+        assert chunk2.id not in ids
     
     def test_list_chunks_by_document(self):
         """Test listing chunks by document ID"""
         # Arrange
         other_document_id = uuid4()
-        chunk2 = Chunk(
-            library_id=self.library_id,
-            document_id=other_document_id,
-            text="Other document chunk",
-            position=0,
-            embedding=[0.6, 0.7, 0.8, 0.9, 1.0]
-        )
-        self.repo.add(self.test_chunk)
-        self.repo.add(chunk2)
+        chunk2 = self._mk(document_id=other_document_id, text="Other document chunk", embedding=list(_EMB_B))
+        self.repo.add_bulk([self.test_chunk, chunk2])
         
         # Act
         document_chunks = self.repo.list_by_document(self.document_id)
         
         # Assert
         assert len(document_chunks) == 1
-        assert self.test_chunk in document_chunks
-        assert chunk2 not in document_chunks
+        ids = {c.id for c in document_chunks}
+        assert self.test_chunk.id in ids
+        assert chunk2.id not in ids
     
     def test_list_chunks_by_nonexistent_library(self):
         """Test listing chunks for a library that doesn't exist"""
@@ -150,22 +131,25 @@ class TestChunkRepo:
         # Assert
         assert len(chunks) == 0
     
-    def test_update_chunk(self):
-        """Test updating a chunk using update_on_version"""
+    @pytest.mark.parametrize("field,value", [
+        ("text", "Updated chunk text"),
+        ("position", 1),
+        ("embedding", list(_EMB_C)),
+    ])
+    def test_update_field(self, field, value):
+        """Test update_on_version across the updatable chunk fields"""
         # Arrange
         self.repo.add(self.test_chunk)
         original_version = self.test_chunk.version
         
         # Act
-        self.test_chunk.text = "Updated chunk text"
-        self.test_chunk.position = 1
+        setattr(self.test_chunk, field, value)
         success = self.repo.update_on_version(self.test_chunk, original_version)
         
         # Assert
         assert success is True
         updated_chunk = self.repo.get(self.test_chunk.id)
-        assert updated_chunk.text == "Updated chunk text"
-        assert updated_chunk.position == 1
+        assert getattr(updated_chunk, field) == value
         assert updated_chunk.version == original_version + 1
     
     def test_update_nonexistent_chunk(self):
@@ -186,7 +170,7 @@ class TestChunkRepo:
         
         # Assert
         assert deleted is True
-        assert len(self.repo.chunks) == 0
+        assert self.repo.size() == 0
         assert self.repo.get(self.test_chunk.id) is None
     
     def test_delete_nonexistent_chunk(self):
@@ -197,91 +181,51 @@ class TestChunkRepo:
         # Assert
         assert deleted is False
     
-    def test_chunk_version_increment(self):
-        """Test that chunk version increments on update"""
-        # Arrange
-        self.repo.add(self.test_chunk)
-        original_version = self.test_chunk.version
-        
-        # Act
-        self.test_chunk.text = "Updated text"
-        success = self.repo.update_on_version(self.test_chunk, original_version)
-        
-        # Assert
-        assert success is True
-        updated_chunk = self.repo.get(self.test_chunk.id)
-        assert updated_chunk.version == original_version + 1
-    
     def test_chunk_timestamps(self):
-        """Test that timestamps are properly managed"""
-        # Arrange - create a new chunk for this test
+        """Test that timestamps come from the repo's injected clock"""
+        # Arrange - drive the repo with a deterministic clock
+        t_add = datetime(2024, 1, 1, 12, 0, 0)
+        t_update = datetime(2024, 1, 1, 12, 0, 1)
+        times = iter([t_add, t_update])
+        repo = ChunkRepo(time_func=lambda: next(times))
         test_chunk = Chunk(
             library_id=self.library_id,
             document_id=self.document_id,
             text="Timestamp test chunk",
             position=0,
-            embedding=[0.1, 0.2, 0.3, 0.4, 0.5],
+            embedding=list(_EMB_A),
             metadata=ChunkMetadata(
                 token_count=4,
                 tags=["timestamp", "test"]
             )
         )
         
-        # Store original timestamps (these will be different from what the repo sets)
-        original_created_at = test_chunk.created_at
-        original_updated_at = test_chunk.updated_at
-        
         # Act - repository will set its own timestamps
-        before_add = datetime.utcnow()
-        self.repo.add(test_chunk)
-        after_add = datetime.utcnow()
+        repo.add(test_chunk)
         
-        # Assert - repository should have set new timestamps
-        assert before_add <= test_chunk.created_at <= after_add
-        assert before_add <= test_chunk.updated_at <= after_add
-        # created_at and updated_at should be the same when chunk is added
-        assert test_chunk.created_at == test_chunk.updated_at
+        # Assert - both timestamps are exactly the first clock tick
+        assert test_chunk.created_at == t_add
+        assert test_chunk.updated_at == t_add
         
         # Test that repository preserves timestamps correctly
-        retrieved_chunk = self.repo.get(test_chunk.id)
+        retrieved_chunk = repo.get(test_chunk.id)
         assert retrieved_chunk.created_at == test_chunk.created_at
         assert retrieved_chunk.updated_at == test_chunk.updated_at
         assert retrieved_chunk.created_at == retrieved_chunk.updated_at
         
-        # Test update - version should increment and updated_at should be updated
+        # Test update - version should increment and updated_at should advance
         test_chunk.text = "Updated text"
         current_version = test_chunk.version  # Store the current version before update
-        # Store the updated_at timestamp before the update
-        updated_at_before_update = test_chunk.updated_at
-        before_update = datetime.utcnow()
-        success = self.repo.update_on_version(test_chunk, current_version)
-        after_update = datetime.utcnow()
+        success = repo.update_on_version(test_chunk, current_version)
         
         assert success is True
-        updated_chunk = self.repo.get(test_chunk.id)
+        updated_chunk = repo.get(test_chunk.id)
         # Version should increment
         assert updated_chunk.version == current_version + 1
         # created_at should remain the same as when it was added
-        assert updated_chunk.created_at == test_chunk.created_at
-        # updated_at should be newer than the original and within our time window
-        assert updated_chunk.updated_at > updated_at_before_update
-        assert before_update <= updated_chunk.updated_at <= after_update
-    
-    def test_chunk_embedding_management(self):
-        """Test that embeddings are properly stored and retrieved"""
-        # Arrange
-        new_embedding = [0.9, 0.8, 0.7, 0.6, 0.5]
-        self.repo.add(self.test_chunk)
-        
-        # Act
-        self.test_chunk.embedding = new_embedding
-        success = self.repo.update_on_version(self.test_chunk, self.test_chunk.version)
-        
-        # Assert
-        assert success is True
-        updated_chunk = self.repo.get(self.test_chunk.id)
-        assert updated_chunk.embedding == new_embedding
-        assert len(updated_chunk.embedding) == 5
+        assert updated_chunk.created_at == t_add
+        # updated_at should be exactly the second clock tick
+        assert updated_chunk.updated_at == t_update
     
     def test_chunk_metadata_management(self):
         """Test that metadata is properly stored and retrieved"""
@@ -300,22 +244,6 @@ class TestChunkRepo:
         assert "updated" in updated_chunk.metadata.tags
         assert len(updated_chunk.metadata.tags) == 3  # original 2 + 1 new
     
-    def test_update_on_version(self):
-        """Test optimistic concurrency control with version"""
-        # Arrange
-        self.repo.add(self.test_chunk)
-        original_version = self.test_chunk.version
-        
-        # Act
-        self.test_chunk.text = "Updated text"
-        success = self.repo.update_on_version(self.test_chunk, original_version)
-        
-        # Assert
-        assert success is True
-        updated_chunk = self.repo.get(self.test_chunk.id)
-        assert updated_chunk.text == "Updated text"
-        assert updated_chunk.version == original_version + 1
-    
     def test_update_on_wrong_version(self):
         """Test that update fails with wrong version"""
         # Arrange
@@ -337,7 +265,7 @@ class TestChunkRepo:
             document_id=self.document_id,
             text="Second chunk",
             position=1,
-            embedding=[0.6, 0.7, 0.8, 0.9, 1.0]
+            embedding=list(_EMB_B)
         )
         chunk3 = Chunk(
             library_id=self.library_id,
@@ -352,7 +280,7 @@ class TestChunkRepo:
         self.repo.add_bulk(chunks_to_add)
         
         # Assert
-        assert len(self.repo.chunks) == 3
+        assert self.repo.size() == 3
         all_chunks = self.repo.list_by_library(self.library_id)
         assert len(all_chunks) == 3
         
@@ -2,57 +2,115 @@
 Unit tests for Chunks router
 """
 
+import json
+
 import pytest
 from uuid import uuid4
-from unittest.mock import Mock, MagicMock
 from datetime import datetime
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
 
-from fastapi.testclient import TestClient
+import httpx
 from fastapi import FastAPI
 
 from vector_db_api.api.routers.chunks import router
 from vector_db_api.api.dto import (
     ChunkIn, ChunkOut, BulkChunksIn, BulkChunksOut
 )
+from vector_db_api.api.deps import get_chunk_svc
 from vector_db_api.models.entities import Chunk
 from vector_db_api.models.metadata import ChunkMetadata
 from vector_db_api.services.exceptions import NotFoundError, ValidationError, ConflictError
 
+# 128-dim embeddings built once at import; tuples so they cannot be mutated
+_EMB_128 = tuple([0.1, 0.2, 0.3] * 42 + [0.1, 0.2])
+_EMB_128_B = tuple([0.4, 0.5, 0.6] * 42 + [0.4, 0.5])
+_SCALED = [tuple([0.1 * i, 0.2 * i, 0.3 * i] * 42 + [0.1 * i, 0.2 * i]) for i in range(10)]
+
+# Identity never crosses tests here, so ids come from a pool minted once
+# at import (uuid4 is a urandom syscall) and timestamps are fixed
+_UUID_POOL = [uuid4() for _ in range(32)]
+_FIXED_TS = datetime(2024, 1, 1)
+
+# The large-batch payload is static, so it is serialized once at import
+# and POSTed as raw bytes instead of re-encoding the dict per run
+_JSON_HEADERS = {"content-type": "application/json"}
+_PAYLOAD_BULK_10 = json.dumps({
+    "chunks": [
+        {
+            "text": f"Chunk {i}",
+            "position": i,
+            "embedding": list(_SCALED[i]),
+            "metadata": {"page_number": i + 1, "token_count": 10 + i}
+        }
+        for i in range(10)
+    ]
+}).encode()
+
+
+class FakeChunkSvc:
+    """Minimal stand-in for the chunk service: records calls without
+    Mock's attribute-dispatch overhead"""
+    __slots__ = ("upsert_ret", "bulk_ret", "upsert_exc", "bulk_exc", "delete_exc", "calls")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.upsert_ret = None
+        self.bulk_ret = None
+        self.upsert_exc = None
+        self.bulk_exc = None
+        self.delete_exc = None
+        self.calls = {"upsert": [], "bulk_upsert": [], "delete": []}
+
+    def upsert(self, *args, **kwargs):
+        self.calls["upsert"].append((args, kwargs))
+        if self.upsert_exc is not None:
+            raise self.upsert_exc
+        return self.upsert_ret
+
+    def bulk_upsert(self, *args, **kwargs):
+        self.calls["bulk_upsert"].append((args, kwargs))
+        if self.bulk_exc is not None:
+            raise self.bulk_exc
+        return self.bulk_ret
+
+    def delete(self, *args, **kwargs):
+        self.calls["delete"].append((args, kwargs))
+        if self.delete_exc is not None:
+            raise self.delete_exc
+        return None
+
+
+@pytest.fixture(scope="module")
+def app_and_mock(configured_app_factory):
+    """App, router, exception handlers and stub service built once per module"""
+    mock_svc = FakeChunkSvc()
+    app = configured_app_factory()
+    app.include_router(router)
+    app.dependency_overrides[get_chunk_svc] = lambda: mock_svc
+    yield app, mock_svc
+    app.dependency_overrides.clear()
+
 
 class TestChunksRouter:
     """Test cases for Chunks router"""
     
-    def setup_method(self):
-        """Set up test fixtures before each test method"""
-        self.mock_chunk_svc = Mock()
-        
-        # Create FastAPI app with the router
-        self.app = FastAPI()
-        self.app.include_router(router)
-        
-        # Add exception handlers
-        from vector_db_api.api.errors import register_exception_handlers
-        register_exception_handlers(self.app)
-        
-        # Override the dependency
-        def get_mock_chunk_svc():
-            return self.mock_chunk_svc
-        
-        # Import the dependency function and override it
-        from vector_db_api.api.deps import get_chunk_svc
-        self.app.dependency_overrides[get_chunk_svc] = get_mock_chunk_svc
-        
-        self.client = TestClient(self.app)
-        
-        self.library_id = uuid4()
-        self.document_id = uuid4()
-        self.chunk_id = uuid4()
-        self.created_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+    @pytest.fixture(autouse=True)
+    async def _setup(self, app_and_mock):
+        """Bind an in-process ASGI client and reset the stub per test
+
+        ASGITransport runs the app on the test's own event loop, skipping
+        the thread portal TestClient drives every request through.
+        """
+        app, self.mock_chunk_svc = app_and_mock
+        self.mock_chunk_svc.reset()
+        
+        self.library_id = _UUID_POOL[0]
+        self.document_id = _UUID_POOL[1]
+        self.chunk_id = _UUID_POOL[2]
+        self.created_at = _FIXED_TS
+        self.updated_at = _FIXED_TS
         
         self.mock_chunk = Chunk(
             id=self.chunk_id,
@@ -60,113 +118,85 @@ class TestChunksRouter:
             document_id=self.document_id,
             text="Test chunk text",
             position=0,
-            embedding=[0.1, 0.2, 0.3] * 42 + [0.1, 0.2],  # 128 dimensions
+            embedding=list(_EMB_128),  # 128 dimensions
             metadata=ChunkMetadata(page_number=1, token_count=10),
             created_at=self.created_at,
             updated_at=self.updated_at,
             version=1
         )
-    
-    def test_upsert_chunk_success(self):
-        """Test successful chunk upsert"""
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            self.client = client
+            yield
+
+    @pytest.mark.parametrize("payload, expected", [
+        (
+            {"text": "Test chunk text", "position": 0, "embedding": "EMB",
+             "metadata": {"page_number": 1, "token_count": 10}},
+            {"text": "Test chunk text", "position": 0},
+        ),
+        (
+            {"id": "CHUNK_ID", "text": "Test chunk text", "position": 0,
+             "embedding": "EMB", "metadata": {}},
+            {"text": "Test chunk text", "id": "CHUNK_ID"},
+        ),
+        (
+            {"text": "Minimal chunk"},
+            {"text": "Minimal chunk", "position": 0, "embedding": None},
+        ),
+        (
+            {"text": "Test chunk conversion", "position": 5, "embedding": "EMB",
+             "metadata": {"page_number": 3, "token_count": 20}},
+            {"text": "Test chunk conversion", "position": 5, "embedding": "EMB"},
+        ),
+        (
+            {"text": "Chunk with standard metadata", "position": 0, "embedding": "EMB",
+             "metadata": {"page_number": 1, "token_count": 10,
+                          "author": "Test Author", "tags": ["test", "chunk"]}},
+            {"metadata.page_number": 1, "metadata.token_count": 10,
+             "metadata.author": "Test Author", "metadata.tags": ["test", "chunk"]},
+        ),
+    ], ids=["success", "with_id", "minimal", "conversion", "standard_metadata"])
+    async def test_upsert_chunk(self, payload, expected):
+        """Upsert variants: payload differences and the entity fields they produce
+
+        "EMB"/"CHUNK_ID" sentinels are resolved against the per-test ids
+        since parametrize arguments are evaluated before the fixtures run.
+        """
         # Arrange
-        self.mock_chunk_svc.upsert.return_value = self.mock_chunk
-        
-        request_data = {
-            "text": "Test chunk text",
-            "position": 0,
-            "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
-            "metadata": {
-                "page_number": 1,
-                "token_count": 10
-            }
-        }
+        self.mock_chunk_svc.upsert_ret = self.mock_chunk
+        payload = dict(payload)
+        if payload.get("embedding") == "EMB":
+            payload["embedding"] = list(_EMB_128)
+        if "id" in payload:
+            payload["id"] = str(self.chunk_id)
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=payload)
         
         # Assert
         assert response.status_code == 200
-        data = response.json()
-        assert data["id"] == str(self.chunk_id)
-        assert data["library_id"] == str(self.library_id)
-        assert data["document_id"] == str(self.document_id)
-        assert data["text"] == "Test chunk text"
-        assert data["position"] == 0
-        assert data["metadata"]["page_number"] == 1
-        assert data["metadata"]["token_count"] == 10
-        assert data["version"] == 1
-        
-        self.mock_chunk_svc.upsert.assert_called_once()
-        call_args = self.mock_chunk_svc.upsert.call_args
-        chunk = call_args[0][0]
-        assert chunk.text == "Test chunk text"
-        assert chunk.position == 0
+        assert response.json()["id"] == str(self.chunk_id)
+        
+        assert len(self.mock_chunk_svc.calls["upsert"]) == 1
+        chunk = self.mock_chunk_svc.calls["upsert"][0][0][0]
         assert chunk.library_id == self.library_id
         assert chunk.document_id == self.document_id
+        for attr, want in expected.items():
+            if want == "EMB":
+                want = list(_EMB_128)
+            elif want == "CHUNK_ID":
+                want = self.chunk_id
+            value = chunk
+            for part in attr.split("."):
+                value = getattr(value, part)
+            assert value == want
     
-    def test_upsert_chunk_with_id(self):
-        """Test chunk upsert with provided ID"""
-        # Arrange
-        self.mock_chunk_svc.upsert.return_value = self.mock_chunk
-        
-        request_data = {
-            "id": str(self.chunk_id),
-            "text": "Test chunk text",
-            "position": 0,
-            "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
-            "metadata": {}
-        }
-        
-        # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
-        
-        # Assert
-        assert response.status_code == 200
-        data = response.json()
-        assert data["id"] == str(self.chunk_id)
-        
-        self.mock_chunk_svc.upsert.assert_called_once()
-        call_args = self.mock_chunk_svc.upsert.call_args
-        chunk = call_args[0][0]
-        assert chunk.id == self.chunk_id
-    
-    def test_upsert_chunk_minimal_data(self):
-        """Test chunk upsert with minimal required data"""
-        # Arrange
-        minimal_chunk = Chunk(
-            id=self.chunk_id,
-            library_id=self.library_id,
-            document_id=self.document_id,
-            text="Minimal chunk",
-            position=0,
-            embedding=None,
-            metadata=ChunkMetadata(),
-            created_at=self.created_at,
-            updated_at=self.updated_at,
-            version=1
-        )
-        self.mock_chunk_svc.upsert.return_value = minimal_chunk
-        
-        request_data = {
-            "text": "Minimal chunk"
-        }
-        
-        # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
-        
-        # Assert
-        assert response.status_code == 200
-        data = response.json()
-        assert data["text"] == "Minimal chunk"
-        assert data["position"] == 0
-        
-        self.mock_chunk_svc.upsert.assert_called_once()
-    
-    def test_upsert_chunk_validation_error(self):
+    async def test_upsert_chunk_validation_error(self):
         """Test chunk upsert with validation error"""
         # Arrange
-        self.mock_chunk_svc.upsert.side_effect = ValidationError("Invalid embedding dimension")
+        self.mock_chunk_svc.upsert_exc = ValidationError("Invalid embedding dimension")
         
         request_data = {
             "text": "Test chunk",
@@ -174,110 +204,110 @@ class TestChunksRouter:
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
         
         # Assert
         assert response.status_code == 422
-        self.mock_chunk_svc.upsert.assert_called_once()
+        assert len(self.mock_chunk_svc.calls["upsert"]) == 1
     
-    def test_upsert_chunk_not_found(self):
+    async def test_upsert_chunk_not_found(self):
         """Test chunk upsert when library or document doesn't exist"""
         # Arrange
-        self.mock_chunk_svc.upsert.side_effect = NotFoundError(f"Library with id {self.library_id} not found")
+        self.mock_chunk_svc.upsert_exc = NotFoundError(f"Library with id {self.library_id} not found")
         
         request_data = {
             "text": "Test chunk",
-            "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2]
+            "embedding": list(_EMB_128)
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
         
         # Assert
         assert response.status_code == 404
-        self.mock_chunk_svc.upsert.assert_called_once()
+        assert len(self.mock_chunk_svc.calls["upsert"]) == 1
     
-    def test_upsert_chunk_missing_text(self):
+    async def test_upsert_chunk_missing_text(self):
         """Test chunk upsert with missing required text field"""
         # Arrange
         request_data = {
             "position": 0,
-            "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2]
+            "embedding": list(_EMB_128)
             # Missing text field
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
         
         # Assert
         assert response.status_code == 422  # Validation error from FastAPI
-        self.mock_chunk_svc.upsert.assert_not_called()
+        assert not self.mock_chunk_svc.calls["upsert"]
     
-    def test_upsert_chunk_invalid_position(self):
+    async def test_upsert_chunk_invalid_position(self):
         """Test chunk upsert with invalid position"""
         # Arrange
         request_data = {
             "text": "Test chunk",
             "position": -1,  # Invalid position
-            "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2]
+            "embedding": list(_EMB_128)
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
         
         # Assert
         assert response.status_code == 422  # Validation error from FastAPI
-        self.mock_chunk_svc.upsert.assert_not_called()
+        assert not self.mock_chunk_svc.calls["upsert"]
     
-    def test_bulk_upsert_chunks_success(self):
+    async def test_bulk_upsert_chunks_success(self):
         """Test successful bulk chunk upsert"""
         # Arrange
         chunk1 = Chunk(
-            id=uuid4(),
+            id=_UUID_POOL[3],
             library_id=self.library_id,
             document_id=self.document_id,
             text="First chunk",
             position=0,
-            embedding=[0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
+            embedding=list(_EMB_128),
             metadata=ChunkMetadata(page_number=1, token_count=10),
             created_at=self.created_at,
             updated_at=self.updated_at,
             version=1
         )
         chunk2 = Chunk(
-            id=uuid4(),
+            id=_UUID_POOL[4],
             library_id=self.library_id,
             document_id=self.document_id,
             text="Second chunk",
             position=1,
-            embedding=[0.4, 0.5, 0.6] * 42 + [0.4, 0.5],
+            embedding=list(_EMB_128_B),
             metadata=ChunkMetadata(page_number=2, token_count=15),
             created_at=self.created_at,
             updated_at=self.updated_at,
             version=1
         )
         
-        self.mock_chunk_svc.bulk_upsert.return_value = [chunk1, chunk2]
+        self.mock_chunk_svc.bulk_ret = [chunk1, chunk2]
         
         request_data = {
             "chunks": [
                 {
                     "text": "First chunk",
                     "position": 0,
-                    "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
+                    "embedding": list(_EMB_128),
                     "metadata": {"page_number": 1, "token_count": 10}
                 },
                 {
                     "text": "Second chunk",
                     "position": 1,
-                    "embedding": [0.4, 0.5, 0.6] * 42 + [0.4, 0.5],
+                    "embedding": list(_EMB_128_B),
                     "metadata": {"page_number": 2, "token_count": 15}
                 }
             ]
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
         
         # Assert
         assert response.status_code == 201
@@ -286,8 +316,8 @@ class TestChunksRouter:
         assert data["chunk_ids"][0] == str(chunk1.id)
         assert data["chunk_ids"][1] == str(chunk2.id)
         
-        self.mock_chunk_svc.bulk_upsert.assert_called_once()
-        call_args = self.mock_chunk_svc.bulk_upsert.call_args
+        assert len(self.mock_chunk_svc.calls["bulk_upsert"]) == 1
+        call_args = self.mock_chunk_svc.calls["bulk_upsert"][0]
         assert call_args[0][0] == self.library_id  # lib_id
         assert call_args[0][1] == self.document_id  # doc_id
         chunks = call_args[0][2]
@@ -295,57 +325,56 @@ class TestChunksRouter:
         assert chunks[0].text == "First chunk"
         assert chunks[1].text == "Second chunk"
     
-    def test_bulk_upsert_chunks_single_chunk(self):
+    async def test_bulk_upsert_chunks_single_chunk(self):
         """Test bulk upsert with single chunk"""
         # Arrange
-        self.mock_chunk_svc.bulk_upsert.return_value = [self.mock_chunk]
+        self.mock_chunk_svc.bulk_ret = [self.mock_chunk]
         
         request_data = {
             "chunks": [
                 {
                     "text": "Single chunk",
                     "position": 0,
-                    "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
+                    "embedding": list(_EMB_128),
                     "metadata": {}
                 }
             ]
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
         
         # Assert
         assert response.status_code == 201
-        data = response.json()
-        assert len(data["chunk_ids"]) == 1
-        assert data["chunk_ids"][0] == str(self.chunk_id)
+        # Single decode, single body assertion
+        assert response.json()["chunk_ids"] == [str(self.chunk_id)]
         
-        self.mock_chunk_svc.bulk_upsert.assert_called_once()
+        assert len(self.mock_chunk_svc.calls["bulk_upsert"]) == 1
     
-    def test_bulk_upsert_chunks_validation_error(self):
+    async def test_bulk_upsert_chunks_validation_error(self):
         """Test bulk upsert with validation error"""
         # Arrange
-        self.mock_chunk_svc.bulk_upsert.side_effect = ValidationError("Invalid chunk data")
+        self.mock_chunk_svc.bulk_exc = ValidationError("Invalid chunk data")
         
         request_data = {
             "chunks": [
                 {
                     "text": "Test chunk",
                     "position": 0,
-                    "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
+                    "embedding": list(_EMB_128),
                     "metadata": {}
                 }
             ]
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
         
         # Assert
         assert response.status_code == 422
-        self.mock_chunk_svc.bulk_upsert.assert_called_once()
+        assert len(self.mock_chunk_svc.calls["bulk_upsert"]) == 1
     
-    def test_bulk_upsert_chunks_empty_list(self):
+    async def test_bulk_upsert_chunks_empty_list(self):
         """Test bulk upsert with empty chunks list"""
         # Arrange
         request_data = {
@@ -353,24 +382,24 @@ class TestChunksRouter:
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
         
         # Assert
         assert response.status_code == 422  # Validation error from FastAPI
-        self.mock_chunk_svc.bulk_upsert.assert_not_called()
+        assert not self.mock_chunk_svc.calls["bulk_upsert"]
     
-    def test_bulk_upsert_chunks_large_batch(self):
+    async def test_bulk_upsert_chunks_large_batch(self):
         """Test bulk upsert with large batch of chunks"""
         # Arrange
         chunks = []
         for i in range(10):
             chunk = Chunk(
-                id=uuid4(),
+                id=_UUID_POOL[8 + i],
                 library_id=self.library_id,
                 document_id=self.document_id,
                 text=f"Chunk {i}",
                 position=i,
-                embedding=[0.1 * i, 0.2 * i, 0.3 * i] * 42 + [0.1 * i, 0.2 * i],
+                embedding=list(_SCALED[i]),
                 metadata=ChunkMetadata(page_number=i + 1, token_count=10 + i),
                 created_at=self.created_at,
                 updated_at=self.updated_at,
@@ -378,84 +407,72 @@ class TestChunksRouter:
             )
             chunks.append(chunk)
         
-        self.mock_chunk_svc.bulk_upsert.return_value = chunks
-        
-        request_data = {
-            "chunks": [
-                {
-                    "text": f"Chunk {i}",
-                    "position": i,
-                    "embedding": [0.1 * i, 0.2 * i, 0.3 * i] * 42 + [0.1 * i, 0.2 * i],
-                    "metadata": {"page_number": i + 1, "token_count": 10 + i}
-                }
-                for i in range(10)
-            ]
-        }
+        self.mock_chunk_svc.bulk_ret = chunks
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
+        response = await self.client.post(
+            f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk",
+            content=_PAYLOAD_BULK_10,
+            headers=_JSON_HEADERS,
+        )
         
         # Assert
         assert response.status_code == 201
-        data = response.json()
-        assert len(data["chunk_ids"]) == 10
+        assert len(response.json()["chunk_ids"]) == 10
         
-        self.mock_chunk_svc.bulk_upsert.assert_called_once()
-        call_args = self.mock_chunk_svc.bulk_upsert.call_args
+        assert len(self.mock_chunk_svc.calls["bulk_upsert"]) == 1
+        call_args = self.mock_chunk_svc.calls["bulk_upsert"][0]
         chunks = call_args[0][2]
         assert len(chunks) == 10
         for i, chunk in enumerate(chunks):
             assert chunk.text == f"Chunk {i}"
             assert chunk.position == i
     
-    def test_delete_chunk_success(self):
+    async def test_delete_chunk_success(self):
         """Test successful chunk deletion"""
-        # Arrange
-        self.mock_chunk_svc.delete.return_value = None
-        
         # Act
-        response = self.client.delete(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks/{self.chunk_id}")
+        response = await self.client.delete(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks/{self.chunk_id}")
         
         # Assert
         assert response.status_code == 204
         assert response.content == b""  # No content for 204
-        self.mock_chunk_svc.delete.assert_called_once_with(self.library_id, self.chunk_id)
+        assert self.mock_chunk_svc.calls["delete"] == [((self.library_id, self.chunk_id), {})]
     
-    def test_delete_chunk_not_found(self):
+    async def test_delete_chunk_not_found(self):
         """Test chunk deletion when chunk doesn't exist"""
         # Arrange
-        self.mock_chunk_svc.delete.side_effect = NotFoundError(f"Chunk with id {self.chunk_id} not found")
+        self.mock_chunk_svc.delete_exc = NotFoundError(f"Chunk with id {self.chunk_id} not found")
         
         # Act
-        response = self.client.delete(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks/{self.chunk_id}")
+        response = await self.client.delete(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks/{self.chunk_id}")
         
         # Assert
         assert response.status_code == 404
-        self.mock_chunk_svc.delete.assert_called_once_with(self.library_id, self.chunk_id)
+        assert self.mock_chunk_svc.calls["delete"] == [((self.library_id, self.chunk_id), {})]
     
-    def test_delete_chunk_invalid_uuid(self):
+    async def test_delete_chunk_invalid_uuid(self):
         """Test chunk deletion with invalid UUID"""
         # Act
-        response = self.client.delete(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks/invalid-uuid")
+        response = await self.client.delete(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks/invalid-uuid")
         
         # Assert
         assert response.status_code == 422  # Validation error
-        self.mock_chunk_svc.delete.assert_not_called()
+        assert not self.mock_chunk_svc.calls["delete"]
     
-    def test_chunk_response_structure(self):
+    async def test_chunk_response_structure(self):
         """Test that chunk response has correct structure"""
         # Arrange
-        self.mock_chunk_svc.upsert.return_value = self.mock_chunk
+        self.mock_chunk_svc.upsert_ret = self.mock_chunk
         
         request_data = {
             "text": "Test chunk",
             "position": 0,
-            "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
+            "embedding": list(_EMB_128),
             "metadata": {"page_number": 1, "token_count": 10}
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
         
         # Assert
         assert response.status_code == 200
@@ -478,82 +495,23 @@ class TestChunksRouter:
         assert isinstance(data["metadata"], dict)
         assert isinstance(data["version"], int)
     
-    def test_chunk_request_to_entity_conversion(self):
-        """Test that chunk request data is properly converted to entity"""
-        # Arrange
-        self.mock_chunk_svc.upsert.return_value = self.mock_chunk
-        
-        request_data = {
-            "text": "Test chunk conversion",
-            "position": 5,
-            "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
-            "metadata": {"page_number": 3, "token_count": 20}
-        }
-        
-        # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
-        
-        # Assert
-        assert response.status_code == 200
-        
-        # Verify the chunk was properly converted
-        call_args = self.mock_chunk_svc.upsert.call_args
-        chunk = call_args[0][0]
-        assert chunk.text == "Test chunk conversion"
-        assert chunk.position == 5
-        assert chunk.library_id == self.library_id
-        assert chunk.document_id == self.document_id
-        assert chunk.embedding == [0.1, 0.2, 0.3] * 42 + [0.1, 0.2]
-        # Note: metadata is passed as dict, not converted to ChunkMetadata object
-    
-    def test_chunk_with_standard_metadata(self):
-        """Test chunk creation with standard metadata fields"""
-        # Arrange
-        self.mock_chunk_svc.upsert.return_value = self.mock_chunk
-        
-        request_data = {
-            "text": "Chunk with standard metadata",
-            "position": 0,
-            "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
-            "metadata": {
-                "page_number": 1,
-                "token_count": 10,
-                "author": "Test Author",
-                "tags": ["test", "chunk"]
-            }
-        }
-        
-        # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks", json=request_data)
-        
-        # Assert
-        assert response.status_code == 200
-        
-        # Verify the standard metadata was preserved
-        call_args = self.mock_chunk_svc.upsert.call_args
-        chunk = call_args[0][0]
-        assert chunk.metadata.page_number == 1
-        assert chunk.metadata.token_count == 10
-        assert chunk.metadata.author == "Test Author"
-        assert chunk.metadata.tags == ["test", "chunk"]
-    
-    def test_bulk_upsert_with_mixed_chunk_data(self):
+    async def test_bulk_upsert_with_mixed_chunk_data(self):
         """Test bulk upsert with chunks having different data patterns"""
         # Arrange
         chunk1 = Chunk(
-            id=uuid4(),
+            id=_UUID_POOL[5],
             library_id=self.library_id,
             document_id=self.document_id,
             text="Chunk with embedding",
             position=0,
-            embedding=[0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
+            embedding=list(_EMB_128),
             metadata=ChunkMetadata(),
             created_at=self.created_at,
             updated_at=self.updated_at,
             version=1
         )
         chunk2 = Chunk(
-            id=uuid4(),
+            id=_UUID_POOL[6],
             library_id=self.library_id,
             document_id=self.document_id,
             text="Chunk without embedding",
@@ -565,14 +523,14 @@ class TestChunksRouter:
             version=1
         )
         
-        self.mock_chunk_svc.bulk_upsert.return_value = [chunk1, chunk2]
+        self.mock_chunk_svc.bulk_ret = [chunk1, chunk2]
         
         request_data = {
             "chunks": [
                 {
                     "text": "Chunk with embedding",
                     "position": 0,
-                    "embedding": [0.1, 0.2, 0.3] * 42 + [0.1, 0.2],
+                    "embedding": list(_EMB_128),
                     "metadata": {}
                 },
                 {
@@ -584,15 +542,14 @@ class TestChunksRouter:
         }
         
         # Act
-        response = self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
+        response = await self.client.post(f"/libraries/{self.library_id}/documents/{self.document_id}/chunks:bulk", json=request_data)
         
         # Assert
         assert response.status_code == 201
-        data = response.json()
-        assert len(data["chunk_ids"]) == 2
+        assert len(response.json()["chunk_ids"]) == 2
         
         # Verify both chunks were properly converted
-        call_args = self.mock_chunk_svc.bulk_upsert.call_args
+        call_args = self.mock_chunk_svc.calls["bulk_upsert"][0]
         chunks = call_args[0][2]
         assert len(chunks) == 2
         assert chunks[0].text == "Chunk with embedding"
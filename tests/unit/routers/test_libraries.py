@@ -7,14 +7,13 @@ from uuid import uuid4
 from unittest.mock import Mock, MagicMock
 from datetime import datetime
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
 
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 
 from vector_db_api.api.routers.libraries import router
+from vector_db_api.api.deps import get_library_svc
+from vector_db_api.api.errors import register_exception_handlers
 from vector_db_api.api.dto import (
     LibraryCreate, LibraryOut, IndexConfigIn, IndexConfigOut,
     Page, PageMetadata, RebuildIndexOut
@@ -36,16 +35,12 @@ class TestLibrariesRouter:
         self.app = FastAPI()
         self.app.include_router(router)
         
-        # Add exception handlers
-        from vector_db_api.api.errors import register_exception_handlers
         register_exception_handlers(self.app)
         
         # Override the dependency
         def get_mock_library_svc():
             return self.mock_library_svc
         
-        # Import the dependency function and override it
-        from vector_db_api.api.deps import get_library_svc
         self.app.dependency_overrides[get_library_svc] = get_mock_library_svc
         
         self.client = TestClient(self.app)
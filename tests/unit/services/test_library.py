@@ -6,9 +6,6 @@ import pytest
 from uuid import uuid4
 from unittest.mock import Mock, MagicMock
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
 
 from vector_db_api.services.library import LibraryService
 from vector_db_api.services.exceptions import NotFoundError, ValidationError, ConflictError
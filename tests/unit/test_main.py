@@ -7,9 +7,6 @@ from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 from uuid import uuid4
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from vector_db_api.main import app
 